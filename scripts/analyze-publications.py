@@ -35,25 +35,43 @@ Usage:
     # Process both languages
     python scripts/analyze-publications.py --batch en
     python scripts/analyze-publications.py --batch fr
+
+    # Show which publications are new, stale, orphaned or unchanged (no NLP)
+    python scripts/analyze-publications.py --plan
+    python scripts/analyze-publications.py --plan --batch fr --model trf
+
+    # Transformer model: segments are batched by length to bound padding
+    # (lower --batch-words for smaller batches; it is a heuristic, not a cap)
+    python scripts/analyze-publications.py --batch fr --model trf --batch-words 1000
+
+    # Continue an interrupted batch run, skipping documents already done
+    python scripts/analyze-publications.py --batch fr --resume
+
+    # Give up on a document after 10 minutes without progress, and limit the
+    # worker to 8 GB of address space (Unix)
+    python scripts/analyze-publications.py --batch fr --timeout 600 --max-memory 8192
+
+Batch runs record each document's status, timing and input hash in
+scripts/texts/.analysis-manifest.json [gitignored].
 """
 
 import argparse
+import hashlib
 import json
+import multiprocessing
+import os
 import re
+import sys
+import time
 from collections import Counter
-from datetime import date
+from datetime import date, datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 
-# NLP libraries - install with: pip install spacy
 try:
-    import spacy
+    import resource  # Unix only; used for --max-memory
 except ImportError:
-    print("Please install spacy: pip install spacy")
-    print("Then download models: python -m spacy download en_core_web_sm")
-    print("                      python -m spacy download fr_core_news_sm")
-    exit(1)
-
+    resource = None
 
 
 # Configuration
@@ -61,6 +79,25 @@ TOP_N_WORDS = 200  # Number of top words to keep per publication
 MIN_WORD_LENGTH = 3  # Minimum word length to include
 MIN_WORD_FREQ = 2  # Minimum frequency to include
 
+# Transformer (trf) scheduling: documents are split into segments that are
+# batched by length, so padding and activation memory stay bounded on CPU
+SEGMENT_MAX_WORDS = 200  # Longest segment sent to the model in one piece
+BATCH_WORD_BUDGET = 2000  # Padded words per nlp.pipe batch (longest x count); a heuristic, not a memory cap
+WINDOW_WORD_BUDGET = 100000  # Raw words of text scheduled together
+TRF_DISABLED_PIPES = ('parser', 'ner')  # Not needed for lemmas and POS
+
+# Rough CPU throughput per model, used by --plan when no timing is recorded
+ESTIMATED_WORDS_PER_SECOND = {'sm': 20000, 'md': 15000, 'lg': 10000, 'trf': 500}
+
+# Batch runs: each document is analyzed in a worker process so that a hang
+# or memory blow-up only loses that document
+DOCUMENT_TIMEOUT = 1800  # Seconds without progress before the worker is killed
+BYTES_PER_WORD = 6  # Rough file-size-to-words ratio used to group documents
+MANIFEST_FILE = Path(__file__).parent / 'texts' / '.analysis-manifest.json'
+
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+SENTENCE_BREAK = re.compile(r'(?<=[.!?…])\s+')
+
 # Common English stopwords (for filtering from French texts)
 ENGLISH_STOPWORDS = {
     'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
@@ -127,6 +164,88 @@ CUSTOM_STOPWORDS_FR = {
 } | ENGLISH_STOPWORDS  # Also filter English stopwords from French texts
 
 
+# Map spaCy POS tags to our simplified categories
+POS_MAP = {
+    'NOUN': 'noun',
+    'VERB': 'verb',
+    'ADJ': 'adj',
+    'ADV': 'adv',
+    'PROPN': 'propn',
+}
+
+# Common reference/citation bigrams to exclude
+REFERENCE_BIGRAMS = {
+    # English reference patterns
+    'university press', 'journal of', 'press university', 'oxford university',
+    'cambridge university', 'new york', 'routledge london', 'brill leiden',
+    'palgrave macmillan', 'ed eds', 'vol no', 'pp ed', 'ibid op',
+    # French reference patterns
+    'presses universitaires', 'université de', 'éditions de', 'revue de',
+    'paris éditions', 'presses de', 'cahiers de',
+    # Common meaningless patterns
+    'in the', 'of the', 'and the', 'to the', 'on the', 'at the', 'for the',
+    'de la', 'de le', 'de les', 'à la', 'à le', 'dans le', 'dans la',
+    'sur le', 'sur la', 'pour le', 'pour la', 'par le', 'par la',
+    'en le', 'en la', 'au le', 'du le', 'les de', 'des de',
+    # Author names to exclude (website owner and common co-authors/cited authors)
+    'frédérick madore', 'frederick madore', 'madore frédérick', 'madore frederick',
+    'frédéric madore', 'madore frédéric',
+    'muriel gomez', 'gomez muriel', 'marie nathalie', 'nathalie leblanc',
+    'issouf binaté', 'binaté issouf', 'audet gosselin', 'gosselin audet',
+    'yssoufou traoré', 'traoré yssoufou', 'louis audet', 'leblanc marie',
+    'abdoulaye sounaye', 'sounaye abdoulaye', 'rené otayek', 'otayek rené',
+    'issa cissé', 'cissé issa', 'louis triaud', 'triaud louis',
+    'mamadou bodian', 'bodian mamadou', 'marie miran', 'miran marie',
+    'université laval', 'laval université',
+    # Generic/non-analytical bigrams
+    'islamic africa', 'africa islamic',
+    # Newspaper/journal names (reference artifacts)
+    'islam info', 'info islam', 'nouvelle marche', 'marche nouvelle',
+    'fraternité matin', 'matin fraternité', 'nasr vendredi', 'vendredi nasr',
+    'observateur paalga', 'paalga observateur',
+    'carrefour africain', 'africain carrefour',
+    'togo presse', 'presse togo',
+    'ivoire dimanche', 'dimanche ivoire',
+    'bulletin francopaix', 'francopaix bulletin',
+    'jeune afrique', 'afrique jeune',
+    'canadian journal', 'journal canadian',
+    'revue canadien', 'canadien revue',
+    'croix africa', 'africa croix',
+    # Publisher/university references
+    'indiana university', 'university indiana',
+    'modern african', 'african modern',
+    'write press', 'press write',
+    # Additional author names
+    'denise brégand', 'brégand denise',
+    'cédric mayrargue', 'mayrargue cédric',
+    'limb peter', 'peter limb',
+    'ulrike freitag', 'freitag ulrike',
+    'klaas glenewinkel', 'glenewinkel klaas',
+    'voir miran', 'miran voir',
+    'voir glossair', 'glossair voir',
+    'gilles holder', 'holder gilles',
+    # Organizations and journal references
+    'amnesty international', 'international amnesty',
+    'special issue', 'issue special',
+    'soir info', 'info soir',
+    # Bibliographic noise
+    'page consulter', 'consulter page',
+}
+
+
+def import_spacy():
+    """Import spaCy on first use, so --help and --plan never pay for it."""
+    # NLP libraries - install with: pip install spacy
+    try:
+        import spacy
+    except ImportError:
+        print("Please install spacy: pip install spacy")
+        print("Then download models: python -m spacy download en_core_web_sm")
+        print("                      python -m spacy download fr_core_news_sm")
+        exit(1)
+    return spacy
+
+
 def load_spacy_model(language: str, model_size: str = 'lg'):
     """
     Load the appropriate spaCy model for the language.
@@ -135,7 +254,8 @@ def load_spacy_model(language: str, model_size: str = 'lg'):
         language: 'en' or 'fr'
         model_size: 'sm' (small), 'md' (medium), 'lg' (large), or 'trf' (transformer)
                    Large (lg) is recommended for best accuracy with reasonable speed.
-                   Transformer (trf) is most accurate but slower and requires more RAM.
+                   Transformer (trf) is most accurate but slower and requires more RAM;
+                   it is run through pipe_documents() rather than whole-document calls.
     """
     # Model mapping by language and size
     models = {
@@ -154,6 +274,7 @@ def load_spacy_model(language: str, model_size: str = 'lg'):
     }
 
     model_name = models.get(language, {}).get(model_size, 'en_core_web_lg')
+    spacy = import_spacy()
 
     try:
         nlp = spacy.load(model_name)
@@ -200,28 +321,8 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
-def analyze_text(
-    text: str,
-    language: str,
-    nlp,
-    custom_stopwords: set
-) -> dict:
-    """
-    Analyze text and extract word frequencies with lemmatization.
-
-    Returns a dictionary with word frequencies and metadata.
-    """
-    # Clean the text
-    text = clean_text(text)
-
-    # Process with spaCy (process in chunks for large texts)
-    max_length = 1000000
-    if len(text) > max_length:
-        text = text[:max_length]
-
-    doc = nlp(text)
-
-    # Extract lemmas with POS filtering
+def extract_word_data(doc, custom_stopwords: set) -> list:
+    """Return (lemma, pos) pairs for the content words of a parsed doc."""
     word_data = []
     for token in doc:
         # Skip stopwords, punctuation, spaces, numbers
@@ -242,31 +343,22 @@ def analyze_text(
         if not token.is_alpha:
             continue
 
-        # Map POS tags to our simplified categories
-        pos_map = {
-            'NOUN': 'noun',
-            'VERB': 'verb',
-            'ADJ': 'adj',
-            'ADV': 'adv',
-            'PROPN': 'propn',
-        }
-        pos = pos_map.get(token.pos_, 'other')
+        word_data.append((lemma_lower, POS_MAP.get(token.pos_, 'other')))
 
-        word_data.append({
-            'lemma': lemma_lower,
-            'pos': pos,
-        })
+    return word_data
 
+
+def summarize_word_data(word_data: list) -> dict:
+    """Build word frequencies and stats from (lemma, pos) pairs."""
     # Count frequencies
-    lemma_counts = Counter(w['lemma'] for w in word_data)
+    lemma_counts = Counter(lemma for lemma, _ in word_data)
 
     # Get POS for each lemma (most common POS)
     lemma_pos = {}
-    for w in word_data:
-        lemma = w['lemma']
+    for lemma, pos in word_data:
         if lemma not in lemma_pos:
             lemma_pos[lemma] = Counter()
-        lemma_pos[lemma][w['pos']] += 1
+        lemma_pos[lemma][pos] += 1
 
     # Build frequency list
     frequencies = []
@@ -294,72 +386,32 @@ def analyze_text(
     }
 
 
-def extract_bigrams(text: str, nlp, language: str, top_n: int = 50) -> list:
-    """Extract frequent bigrams (two-word phrases) with better filtering."""
-    doc = nlp(clean_text(text))
+def analyze_text(
+    text: str,
+    language: str,
+    nlp,
+    custom_stopwords: set
+) -> dict:
+    """
+    Analyze text and extract word frequencies with lemmatization.
 
-    # Get custom stopwords for this language
-    custom_stopwords = CUSTOM_STOPWORDS_EN if language == 'en' else CUSTOM_STOPWORDS_FR
+    Returns a dictionary with word frequencies and metadata.
+    """
+    # Clean the text
+    text = clean_text(text)
+
+    # Process with spaCy (process in chunks for large texts)
+    max_length = 1000000
+    if len(text) > max_length:
+        text = text[:max_length]
+
+    doc = nlp(text)
+
+    return summarize_word_data(extract_word_data(doc, custom_stopwords))
 
-    # Common reference/citation bigrams to exclude
-    reference_bigrams = {
-        # English reference patterns
-        'university press', 'journal of', 'press university', 'oxford university',
-        'cambridge university', 'new york', 'routledge london', 'brill leiden',
-        'palgrave macmillan', 'ed eds', 'vol no', 'pp ed', 'ibid op',
-        # French reference patterns
-        'presses universitaires', 'université de', 'éditions de', 'revue de',
-        'paris éditions', 'presses de', 'cahiers de',
-        # Common meaningless patterns
-        'in the', 'of the', 'and the', 'to the', 'on the', 'at the', 'for the',
-        'de la', 'de le', 'de les', 'à la', 'à le', 'dans le', 'dans la',
-        'sur le', 'sur la', 'pour le', 'pour la', 'par le', 'par la',
-        'en le', 'en la', 'au le', 'du le', 'les de', 'des de',
-        # Author names to exclude (website owner and common co-authors/cited authors)
-        'frédérick madore', 'frederick madore', 'madore frédérick', 'madore frederick',
-        'frédéric madore', 'madore frédéric',
-        'muriel gomez', 'gomez muriel', 'marie nathalie', 'nathalie leblanc',
-        'issouf binaté', 'binaté issouf', 'audet gosselin', 'gosselin audet',
-        'yssoufou traoré', 'traoré yssoufou', 'louis audet', 'leblanc marie',
-        'abdoulaye sounaye', 'sounaye abdoulaye', 'rené otayek', 'otayek rené',
-        'issa cissé', 'cissé issa', 'louis triaud', 'triaud louis',
-        'mamadou bodian', 'bodian mamadou', 'marie miran', 'miran marie',
-        'université laval', 'laval université',
-        # Generic/non-analytical bigrams
-        'islamic africa', 'africa islamic',
-        # Newspaper/journal names (reference artifacts)
-        'islam info', 'info islam', 'nouvelle marche', 'marche nouvelle',
-        'fraternité matin', 'matin fraternité', 'nasr vendredi', 'vendredi nasr',
-        'observateur paalga', 'paalga observateur',
-        'carrefour africain', 'africain carrefour',
-        'togo presse', 'presse togo',
-        'ivoire dimanche', 'dimanche ivoire',
-        'bulletin francopaix', 'francopaix bulletin',
-        'jeune afrique', 'afrique jeune',
-        'canadian journal', 'journal canadian',
-        'revue canadien', 'canadien revue',
-        'croix africa', 'africa croix',
-        # Publisher/university references
-        'indiana university', 'university indiana',
-        'modern african', 'african modern',
-        'write press', 'press write',
-        # Additional author names
-        'denise brégand', 'brégand denise',
-        'cédric mayrargue', 'mayrargue cédric',
-        'limb peter', 'peter limb',
-        'ulrike freitag', 'freitag ulrike',
-        'klaas glenewinkel', 'glenewinkel klaas',
-        'voir miran', 'miran voir',
-        'voir glossair', 'glossair voir',
-        'gilles holder', 'holder gilles',
-        # Organizations and journal references
-        'amnesty international', 'international amnesty',
-        'special issue', 'issue special',
-        'soir info', 'info soir',
-        # Bibliographic noise
-        'page consulter', 'consulter page',
-    }
 
+def extract_doc_bigrams(doc, custom_stopwords: set) -> list:
+    """Return the candidate bigrams (lemma pairs) of a parsed doc."""
     bigrams = []
     for i in range(len(doc) - 1):
         t1, t2 = doc[i], doc[i + 1]
@@ -391,12 +443,16 @@ def extract_bigrams(text: str, nlp, language: str, top_n: int = 50) -> list:
         bigram = f"{lemma1} {lemma2}"
 
         # Skip reference/citation patterns
-        if bigram in reference_bigrams:
+        if bigram in REFERENCE_BIGRAMS:
             continue
 
         bigrams.append(bigram)
 
-    # Count and format
+    return bigrams
+
+
+def count_bigrams(bigrams: list, top_n: int = 50) -> list:
+    """Count bigrams and format the most frequent ones."""
     counts = Counter(bigrams)
     return [
         {
@@ -409,6 +465,146 @@ def extract_bigrams(text: str, nlp, language: str, top_n: int = 50) -> list:
     ]
 
 
+def extract_bigrams(text: str, nlp, language: str, top_n: int = 50) -> list:
+    """Extract frequent bigrams (two-word phrases) with better filtering."""
+    doc = nlp(clean_text(text))
+
+    # Get custom stopwords for this language
+    custom_stopwords = CUSTOM_STOPWORDS_EN if language == 'en' else CUSTOM_STOPWORDS_FR
+
+    return count_bigrams(extract_doc_bigrams(doc, custom_stopwords), top_n)
+
+
+def split_segments(text: str, max_words: int = SEGMENT_MAX_WORDS) -> list:
+    """
+    Split raw text into cleaned paragraph segments of at most max_words words.
+
+    Paragraphs longer than max_words are split on sentence boundaries, and
+    single sentences longer than that are cut on word boundaries.
+    """
+    # Drop page numbers before paragraph splitting, as clean_text would
+    text = re.sub(r'\n\d+\n', '\n', text)
+
+    segments = []
+    for paragraph in PARAGRAPH_BREAK.split(text):
+        paragraph = clean_text(paragraph)
+        if not paragraph:
+            continue
+
+        words = paragraph.split()
+        if len(words) <= max_words:
+            segments.append(paragraph)
+            continue
+
+        current = []
+        for sentence in SENTENCE_BREAK.split(paragraph):
+            sentence_words = sentence.split()
+            if current and len(current) + len(sentence_words) > max_words:
+                segments.append(' '.join(current))
+                current = []
+            current.extend(sentence_words)
+            while len(current) > max_words:
+                segments.append(' '.join(current[:max_words]))
+                current = current[max_words:]
+        if current:
+            segments.append(' '.join(current))
+
+    return segments
+
+
+def bucket_segments(segments: list, batch_words: int) -> list:
+    """
+    Group (doc_index, word_count, text, position) segments into length-sorted batches.
+
+    A batch is padded to its longest segment, so its cost is estimated as
+    longest length x batch size and kept within batch_words.
+    """
+    batches = []
+    current = []
+    for segment in sorted(segments, key=lambda s: s[1]):
+        # Sorted ascending, so the newest segment is the longest in the batch
+        if current and segment[1] * (len(current) + 1) > batch_words:
+            batches.append(current)
+            current = []
+        current.append(segment)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def pipe_documents(
+    nlp,
+    documents: Iterable,
+    language: str,
+    batch_words: int = BATCH_WORD_BUDGET,
+    window_words: int = WINDOW_WORD_BUDGET,
+    progress: Optional[Callable[[], None]] = None
+) -> Iterator:
+    """
+    Analyze (publication_id, text) pairs through length-bucketed nlp.pipe batches.
+
+    Documents are read into windows of roughly window_words words. Within a
+    window, every document is split into segments, the segments are bucketed
+    by length and piped through spaCy, and each parsed segment is reduced to
+    lemmas straight away so no Doc outlives its batch. Segment results are
+    reassembled in text order, so frequency ties rank as in whole-document
+    analysis. Yields (publication_id, analysis, bigrams) per document, in
+    input order.
+
+    Unlike whole-document analysis, bigrams spanning a paragraph break or a
+    hard cut inside an over-long sentence are not counted.
+
+    If given, progress is called after every batch.
+    """
+    custom_stopwords = CUSTOM_STOPWORDS_EN if language == 'en' else CUSTOM_STOPWORDS_FR
+    disabled = [name for name in TRF_DISABLED_PIPES if name in nlp.pipe_names]
+
+    def run_window(window: list) -> Iterator:
+        # (doc_index, word_count, text, position); position is text order
+        segments = []
+        for doc_index, (_, text) in enumerate(window):
+            for segment in split_segments(text):
+                segments.append((doc_index, len(segment.split()), segment, len(segments)))
+
+        results = [None] * len(segments)
+        with nlp.select_pipes(disable=disabled):
+            for batch in bucket_segments(segments, batch_words):
+                texts = [segment[2] for segment in batch]
+                for segment, doc in zip(batch, nlp.pipe(texts, batch_size=len(batch))):
+                    results[segment[3]] = (
+                        extract_word_data(doc, custom_stopwords),
+                        extract_doc_bigrams(doc, custom_stopwords),
+                    )
+                if progress:
+                    progress()
+
+        word_data = [[] for _ in window]
+        bigrams = [[] for _ in window]
+        for segment, (segment_words, segment_bigrams) in zip(segments, results):
+            word_data[segment[0]].extend(segment_words)
+            bigrams[segment[0]].extend(segment_bigrams)
+        del results
+
+        for doc_index, (publication_id, _) in enumerate(window):
+            yield (
+                publication_id,
+                summarize_word_data(word_data[doc_index]),
+                count_bigrams(bigrams[doc_index]),
+            )
+
+    window = []
+    window_size = 0
+    for publication_id, text in documents:
+        window.append((publication_id, text))
+        window_size += len(text.split())
+        if window_size >= window_words:
+            yield from run_window(window)
+            window = []
+            window_size = 0
+    if window:
+        yield from run_window(window)
+
+
 def get_output_dir() -> Path:
     """Get the output directory for analysis files."""
     script_dir = Path(__file__).parent
@@ -478,11 +674,165 @@ export const analysis: PublicationTextAnalysis = {{
     return output_file
 
 
-def get_analyzed_publication_count() -> int:
-    """Count the number of analysis files (excluding index.ts)."""
-    output_dir = get_output_dir()
-    existing_files = list(output_dir.glob('*.ts'))
-    return len([f for f in existing_files if f.stem != 'index'])
+def list_analyzed_publications() -> dict:
+    """Map publication IDs to their analysis files (excluding index.ts)."""
+    return {
+        f.stem: f
+        for f in get_output_dir().glob('*.ts')
+        if f.stem != 'index'
+    }
+
+
+def get_texts_dir(language: str) -> Path:
+    """Get the source text directory for a language."""
+    return Path(__file__).parent / 'texts' / language
+
+
+def list_text_files(language: str) -> list:
+    """List the .md and .txt source files for a language."""
+    texts_dir = get_texts_dir(language)
+    return sorted(texts_dir.glob('*.md')) + sorted(texts_dir.glob('*.txt'))
+
+
+def publication_id_for(file_path: Path) -> str:
+    """Derive a publication ID from a filename (remove extension, convert to kebab-case)."""
+    return file_path.stem.lower().replace(' ', '-').replace('_', '-')
+
+
+def read_analysis_language(analysis_file: Path) -> Optional[str]:
+    """Read the language field from the header of a written analysis file."""
+    with open(analysis_file, encoding='utf-8') as f:
+        for line in f:
+            match = re.match(r"\s*language: '(\w+)'", line)
+            if match:
+                return match.group(1)
+            if 'frequencies:' in line:
+                break
+    return None
+
+
+def plan_publications(languages: list, model_size: str) -> dict:
+    """
+    Compare source texts with written analyses without loading any NLP library.
+
+    Returns {'new', 'stale', 'unchanged', 'orphaned', 'unreadable', 'missing'}
+    lists. New and stale hold (publication_id, file_path, words, estimated
+    seconds); unchanged holds (publication_id, file_path), since nothing is
+    read to count them; orphaned holds (publication_id, analysis_file) for
+    analyses whose text is gone; unreadable holds (publication_id, file_path,
+    error) for texts that are not valid UTF-8; missing holds the text
+    directories that do not exist. Analyses of a language whose directory is
+    missing are not reported as orphaned.
+    """
+    manifest = load_manifest()
+    analyzed = list_analyzed_publications()
+    rate = ESTIMATED_WORDS_PER_SECOND.get(model_size, ESTIMATED_WORDS_PER_SECOND['lg'])
+    plan = {'new': [], 'stale': [], 'unchanged': [], 'orphaned': [], 'unreadable': [], 'missing': []}
+    seen_ids = set()
+    present = []
+
+    for language in languages:
+        texts_dir = get_texts_dir(language)
+        if not texts_dir.exists():
+            plan['missing'].append(texts_dir)
+            continue
+        present.append(language)
+        for file_path in list_text_files(language):
+            pub_id = publication_id_for(file_path)
+            seen_ids.add(pub_id)
+            entry = manifest['documents'].get(f"{language}/{file_path.name}", {})
+            output_file = analyzed.get(pub_id)
+
+            if output_file is None:
+                status = 'new'
+            elif entry.get('status') == 'done' and entry.get('inputHash'):
+                # Same test as --resume: the recorded hash and model are authoritative
+                changed = entry['inputHash'] != hash_file(file_path) or entry.get('model') != model_size
+                status = 'stale' if changed else 'unchanged'
+            else:
+                status = 'stale' if file_path.stat().st_mtime > output_file.stat().st_mtime else 'unchanged'
+
+            if status == 'unchanged':
+                plan['unchanged'].append((pub_id, file_path))
+                continue
+
+            try:
+                words = len(file_path.read_text(encoding='utf-8').split())
+            except UnicodeDecodeError as e:
+                plan['unreadable'].append((pub_id, file_path, e))
+                continue
+            if entry.get('status') == 'done' and entry.get('model') == model_size and entry.get('seconds'):
+                seconds = entry['seconds']
+            else:
+                seconds = words / rate
+            plan[status].append((pub_id, file_path, words, seconds))
+
+    for pub_id, output_file in sorted(analyzed.items()):
+        if pub_id not in seen_ids and read_analysis_language(output_file) in present:
+            plan['orphaned'].append((pub_id, output_file))
+
+    return plan
+
+
+def print_plan(languages: list, model_size: str) -> None:
+    """Print what a batch run would do, with estimated work."""
+    plan = plan_publications(languages, model_size)
+
+    print(f"\nPlan for {', '.join(languages)} (model: {model_size})")
+    print("=" * 60)
+    for texts_dir in plan['missing']:
+        print(f"  Directory not found: {texts_dir} (its analyses are not checked)")
+    for status in ('new', 'stale'):
+        for pub_id, file_path, words, seconds in plan[status]:
+            print(f"  {status:<10} {pub_id}  ({file_path.parent.name}/{file_path.name}, {words:,} words, ~{seconds:.0f}s)")
+    for pub_id, output_file in plan['orphaned']:
+        print(f"  {'orphaned':<10} {pub_id}  (no source text; {output_file.name})")
+    for pub_id, file_path, error in plan['unreadable']:
+        print(f"  {'unreadable':<10} {pub_id}  ({file_path.parent.name}/{file_path.name}: {error})")
+
+    todo = plan['new'] + plan['stale']
+    total_words = sum(words for _, _, words, _ in todo)
+    total_seconds = sum(seconds for _, _, _, seconds in todo)
+    print("-" * 60)
+    print(f"New: {len(plan['new'])}, stale: {len(plan['stale'])}, "
+          f"orphaned: {len(plan['orphaned'])}, unchanged: {len(plan['unchanged'])}, "
+          f"unreadable: {len(plan['unreadable'])}")
+    print(f"Estimated work: {len(todo)} publication(s), {total_words:,} words, ~{total_seconds:.0f}s with {model_size}")
+
+
+def hash_file(file_path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest() -> dict:
+    """Load the batch run manifest, or an empty one if none exists yet."""
+    try:
+        manifest = json.loads(MANIFEST_FILE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {'documents': {}}
+    manifest.setdefault('documents', {})
+    return manifest
+
+
+def save_manifest(manifest: dict) -> None:
+    """Write the manifest atomically so a crash never leaves it truncated."""
+    MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = MANIFEST_FILE.with_suffix('.json.tmp')
+    tmp_file.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    os.replace(tmp_file, MANIFEST_FILE)
+
+
+def record_document(manifest: dict, key: str, **fields) -> None:
+    """Update one manifest entry and persist the manifest immediately."""
+    entry = manifest['documents'].setdefault(key, {})
+    entry.update(fields)
+    entry['updatedAt'] = datetime.now().isoformat(timespec='seconds')
+    save_manifest(manifest)
 
 
 def process_single_file(
@@ -514,6 +864,341 @@ def process_single_file(
     return output_path
 
 
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB, where the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def process_files_bucketed(
+    files: list,
+    language: str,
+    nlp,
+    batch_words: int = BATCH_WORD_BUDGET,
+    source: str = 'full-text',
+    progress: Optional[Callable[[], None]] = None
+) -> tuple:
+    """
+    Process (file_path, publication_id) pairs with the length-bucketed scheduler.
+
+    Used for the transformer model, where feeding whole documents one at a
+    time wastes most of each forward pass on padding. Returns (processed IDs,
+    {publication_id: error} for files that could not be read). progress is
+    passed on to pipe_documents.
+    """
+    words_read = 0
+    errors = {}
+
+    def read_documents() -> Iterator:
+        nonlocal words_read
+        for file_path, publication_id in files:
+            print(f"  Reading: {file_path.name}")
+            try:
+                text = extract_text_from_file(file_path)
+            except Exception as e:
+                print(f"  ERROR reading {file_path.name}: {e}")
+                errors[publication_id] = f"{type(e).__name__}: {e}"
+                continue
+            words_read += len(text.split())
+            yield publication_id, text
+
+    processed_ids = []
+    started = time.perf_counter()
+    for publication_id, analysis, bigrams in pipe_documents(
+        nlp, read_documents(), language, batch_words, progress=progress
+    ):
+        output_path = write_publication_file(publication_id, language, analysis, bigrams, source)
+        print(f"  -> Written: {output_path.name}")
+        processed_ids.append(publication_id)
+
+    elapsed = time.perf_counter() - started
+    if elapsed > 0:
+        rss = peak_rss_mb()
+        rss_str = f", peak RSS {rss:.0f} MB" if rss is not None else ''
+        print(f"  Throughput: {words_read} words in {elapsed:.1f}s ({words_read / elapsed:.0f} words/s{rss_str})")
+
+    return processed_ids, errors
+
+
+def _analysis_worker(
+    conn,
+    language: str,
+    model_size: str,
+    batch_words: int,
+    max_memory_mb: Optional[int]
+) -> None:
+    """
+    Worker process entry point: load the model once, then analyze groups of
+    documents on request. Sends ('progress', None) after every document (and
+    every transformer batch), then replies ('done', {publication_id: error})
+    listing the documents of the group that could not be read.
+    """
+    # spaCy and its dependencies are imported before the address-space limit
+    # applies, so a tight limit is reported as such rather than as a failed import
+    import_spacy()
+    limit_note = f" (--max-memory {max_memory_mb} MB)" if max_memory_mb else ''
+    try:
+        if max_memory_mb:
+            limit = max_memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        nlp = load_spacy_model(language, model_size)
+    except MemoryError:
+        conn.send(('memory', f"out of memory loading the model{limit_note}"))
+        return
+    except Exception as e:
+        conn.send(('failed', f"{type(e).__name__}: {e}{limit_note}"))
+        return
+    conn.send(('ready', None))
+
+    def progress() -> None:
+        conn.send(('progress', None))
+
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        try:
+            if model_size == 'trf':
+                _, errors = process_files_bucketed(task, language, nlp, batch_words, progress=progress)
+            else:
+                errors = {}
+                for file_path, publication_id in task:
+                    process_single_file(file_path, publication_id, language, model_size, nlp=nlp)
+                    progress()
+            conn.send(('done', errors))
+        except MemoryError:
+            conn.send(('memory', f"out of memory{limit_note}"))
+        except Exception as e:
+            conn.send(('failed', f"{type(e).__name__}: {e}"))
+
+
+class AnalysisWorker:
+    """
+    A child process holding one loaded spaCy model.
+
+    Documents are sent in groups. If a group times out, runs out of memory or
+    kills the process, the worker is discarded and a fresh one is started for
+    the next group.
+    """
+
+    def __init__(
+        self,
+        language: str,
+        model_size: str,
+        batch_words: int = BATCH_WORD_BUDGET,
+        max_memory_mb: Optional[int] = None
+    ):
+        self.args = (language, model_size, batch_words, max_memory_mb)
+        self.process = None
+        self.conn = None
+
+    def start(self) -> None:
+        context = multiprocessing.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_analysis_worker,
+            args=(child_conn, *self.args),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        # Model loading is not subject to the progress timeout
+        status, detail = self._receive(None)
+        if status != 'ready':
+            self.stop(force=True)
+            raise RuntimeError(f"Worker failed to start ({status}): {detail}")
+
+    def run(self, group: list, timeout: Optional[float]) -> tuple:
+        """
+        Analyze a group of (file_path, publication_id) pairs, allowing timeout
+        seconds between progress messages. Returns ('done', {publication_id:
+        error}) or (status, error detail).
+        """
+        if self.process is None:
+            self.start()
+        self.conn.send(group)
+        status, detail = self._receive(timeout)
+        while status == 'progress':
+            status, detail = self._receive(timeout)
+        if status in ('timeout', 'memory', 'crashed'):
+            self.stop(force=True)
+        return status, detail
+
+    def stop(self, force: bool = False) -> None:
+        if self.process is None:
+            return
+        if force:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.process.join(5)
+        self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def _receive(self, timeout: Optional[float]) -> tuple:
+        try:
+            if not self.conn.poll(timeout):
+                return 'timeout', f"no progress for {timeout:g}s"
+            return self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(5)
+            return 'crashed', f"worker exited with code {self.process.exitcode}"
+
+
+def non_negative_float(value: str) -> float:
+    """argparse type for limits where 0 means 'no limit'."""
+    number = float(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {value}")
+    return number
+
+
+def estimate_words(file_path: Path) -> int:
+    """Cheap word-count estimate from the file size, used for grouping."""
+    return max(1, file_path.stat().st_size // BYTES_PER_WORD)
+
+
+def group_documents(documents: list, model_size: str) -> list:
+    """
+    Group pending documents for the worker. With trf, documents are packed up
+    to WINDOW_WORD_BUDGET words so pipe_documents can bucket segments across
+    them; other models analyze whole documents, one per group.
+    """
+    if model_size != 'trf':
+        return [[document] for document in documents]
+
+    groups = []
+    current = []
+    current_words = 0
+    for document in documents:
+        words = document[3]
+        if current and current_words + words > WINDOW_WORD_BUDGET:
+            groups.append(current)
+            current = []
+            current_words = 0
+        current.append(document)
+        current_words += words
+    if current:
+        groups.append(current)
+    return groups
+
+
+def process_batch(
+    files: list,
+    language: str,
+    model_size: str,
+    batch_words: int = BATCH_WORD_BUDGET,
+    timeout: Optional[float] = DOCUMENT_TIMEOUT,
+    max_memory_mb: Optional[int] = None,
+    resume: bool = False
+) -> tuple:
+    """
+    Process (file_path, publication_id) pairs in an isolated worker, recording
+    every document in the run manifest.
+
+    Documents are sent in groups (see group_documents). The worker is killed
+    after timeout seconds without progress: one document, or one transformer
+    batch, so a hung document costs the same whatever the group size. If a
+    group fails as a whole, its documents are retried one at a time so only
+    the bad file is marked failed.
+
+    With resume, documents already done with the same input hash and model
+    are skipped. Returns (processed IDs, failed file names, abort reason or
+    None); the run aborts if the worker cannot be (re)started.
+    """
+    manifest = load_manifest()
+    worker = AnalysisWorker(language, model_size, batch_words, max_memory_mb)
+    processed_ids = []
+    failed = []
+    skipped = 0
+    aborted = None
+
+    pending = []
+    for file_path, pub_id in files:
+        key = f"{language}/{file_path.name}"
+        input_hash = hash_file(file_path)
+        entry = manifest['documents'].get(key, {})
+        if (resume and entry.get('status') == 'done' and
+            entry.get('inputHash') == input_hash and entry.get('model') == model_size):
+            skipped += 1
+            continue
+        pending.append((file_path, pub_id, key, estimate_words(file_path), input_hash))
+
+    def finish(document: tuple, status: str, seconds: Optional[float], detail: Optional[str]) -> None:
+        file_path, pub_id, key = document[:3]
+        record_document(manifest, key, status=status, seconds=seconds, error=detail)
+        if status == 'done':
+            processed_ids.append(pub_id)
+        else:
+            failed.append(file_path.name)
+            print(f"  ERROR processing {file_path.name} ({status}): {detail}")
+
+    def run_group(group: list) -> None:
+        # Recorded before the work starts, so a crash leaves 'running'
+        # behind and --resume retries the documents
+        for file_path, pub_id, key, _, input_hash in group:
+            record_document(
+                manifest, key,
+                publicationId=pub_id,
+                language=language,
+                model=model_size,
+                inputHash=input_hash,
+                status='running',
+                seconds=None,
+                error=None
+            )
+
+        started = time.perf_counter()
+        status, detail = worker.run(
+            [(document[0], document[1]) for document in group],
+            timeout
+        )
+        elapsed = time.perf_counter() - started
+
+        if status != 'done' and len(group) > 1:
+            print(f"  Group of {len(group)} failed ({status}); retrying its documents one at a time")
+            for document in group:
+                run_group([document])
+            return
+
+        # Time spent on a group is shared out by estimated length
+        total_words = sum(document[3] for document in group)
+        for document in group:
+            seconds = round(elapsed * document[3] / total_words, 2)
+            if status != 'done':
+                finish(document, status, seconds, detail)
+            elif document[1] in detail:
+                finish(document, 'failed', seconds, detail[document[1]])
+            else:
+                finish(document, 'done', seconds, None)
+
+    try:
+        for group in group_documents(pending, model_size):
+            try:
+                run_group(group)
+            except RuntimeError as e:
+                aborted = str(e)
+                for document in group:
+                    if manifest['documents'][document[2]].get('status') == 'running':
+                        finish(document, 'failed', None, aborted)
+                break
+    finally:
+        worker.stop()
+
+    if skipped:
+        print(f"\nSkipped {skipped} document(s) already analyzed (--resume)")
+
+    return processed_ids, failed, aborted
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Analyze publication texts for word cloud visualizations'
@@ -548,9 +1233,41 @@ def main():
         choices=['en', 'fr'],
         help='Process all files in scripts/texts/en or scripts/texts/fr'
     )
+    parser.add_argument(
+        '--batch-words',
+        type=int,
+        default=BATCH_WORD_BUDGET,
+        help=f'Heuristic padded-word budget per transformer batch with --model trf; lower it for smaller batches, it is not a hard memory cap (default: {BATCH_WORD_BUDGET})'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='With --batch, skip documents the manifest records as done with unchanged input'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=non_negative_float,
+        default=DOCUMENT_TIMEOUT,
+        help=f'With --batch, seconds the worker may go without finishing a document (or, with --model trf, a batch) before it is killed; 0 disables the limit (default: {DOCUMENT_TIMEOUT})'
+    )
+    parser.add_argument(
+        '--max-memory',
+        type=int,
+        metavar='MB',
+        help='With --batch, address-space limit for the worker process in MB (Unix only)'
+    )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='List new, stale, orphaned and unchanged publications (for --batch language, or both) and exit'
+    )
 
     args = parser.parse_args()
 
+    if args.plan:
+        print_plan([args.batch] if args.batch else ['en', 'fr'], args.model)
+        return
+
     # Auto-detect language from file path if not specified
     language = args.language
     if args.file:
@@ -563,30 +1280,41 @@ def main():
             print(f"Auto-detected language: English")
 
     processed_ids = []
+    aborted = None
+    analyzed_before = list_analyzed_publications()
 
     if args.file and args.id:
         # Process single file
         print(f"\nProcessing single file...")
-        process_single_file(
-            args.file,
-            args.id,
-            language,
-            args.model
-        )
-        processed_ids.append(args.id)
+        if args.model == 'trf':
+            nlp = load_spacy_model(language, args.model)
+            processed_ids, errors = process_files_bucketed(
+                [(args.file, args.id)],
+                language,
+                nlp,
+                args.batch_words
+            )
+            if errors:
+                print(f"\nERROR: could not analyze {args.file}: {errors[args.id]}")
+                exit(1)
+        else:
+            process_single_file(
+                args.file,
+                args.id,
+                language,
+                args.model
+            )
+            processed_ids.append(args.id)
 
     elif args.batch:
         # Process all files in language folder
-        scripts_dir = Path(__file__).parent
-        texts_dir = scripts_dir / 'texts' / args.batch
+        texts_dir = get_texts_dir(args.batch)
 
         if not texts_dir.exists():
             print(f"Directory not found: {texts_dir}")
             exit(1)
 
-        md_files = list(texts_dir.glob('*.md'))
-        txt_files = list(texts_dir.glob('*.txt'))
-        all_files = md_files + txt_files
+        all_files = list_text_files(args.batch)
 
         if not all_files:
             print(f"No .md or .txt files found in {texts_dir}")
@@ -595,24 +1323,26 @@ def main():
         print(f"\nFound {len(all_files)} files in {texts_dir}")
         print("=" * 60)
 
-        # Load NLP model once for efficiency
-        nlp = load_spacy_model(args.batch, args.model)
-
-        for file_path in all_files:
-            # Derive ID from filename (remove extension, convert to kebab-case)
-            pub_id = file_path.stem.lower().replace(' ', '-').replace('_', '-')
-
-            try:
-                process_single_file(
-                    file_path,
-                    pub_id,
-                    args.batch,
-                    args.model,
-                    nlp=nlp
-                )
-                processed_ids.append(pub_id)
-            except Exception as e:
-                print(f"  ERROR processing {file_path.name}: {e}")
+        if args.max_memory and resource is None:
+            print("Warning: --max-memory is not supported on this platform; ignoring it")
+            args.max_memory = None
+
+        files = [(file_path, publication_id_for(file_path)) for file_path in all_files]
+
+        # The worker loads the NLP model once; with trf, segments are
+        # scheduled by length across each group of documents
+        processed_ids, failed, aborted = process_batch(
+            files,
+            args.batch,
+            args.model,
+            args.batch_words,
+            args.timeout or None,
+            args.max_memory,
+            args.resume
+        )
+        if failed:
+            print(f"\n{len(failed)} document(s) failed: {', '.join(failed)}")
+            print(f"Details are recorded in {MANIFEST_FILE}; rerun with --resume to retry them.")
 
     else:
         parser.print_help()
@@ -621,12 +1351,17 @@ def main():
     # Summary
     if processed_ids:
         print("\n" + "=" * 60)
-        total_analyses = get_analyzed_publication_count()
+        # Outputs are only ever added, so no need to list the directory again
+        total_analyses = len(analyzed_before.keys() | set(processed_ids))
         print(f"Done! Processed {len(processed_ids)} publication(s).")
         print(f"Total analyses available: {total_analyses}")
         print(f"Files written to: {get_output_dir()}")
         print(f"\nNote: index.ts uses import.meta.glob() to auto-load all analyses.")
 
+    if aborted:
+        print(f"\nERROR: run stopped early: {aborted}")
+        exit(1)
+
 
 if __name__ == '__main__':
     main()
@@ -4,11 +4,29 @@ Convert an image to .webp format for the website.
 Generates card-size and/or hero-size versions and places them
 in the correct static/images/<content-type>/ directory.
 
+The responsive width ladder (and optionally AVIF copies) is written to
+static/images/_r/ from the same decoded source, using the names
+generate-image-variants.mjs expects. Its cache is updated too, so the Node
+pass does not re-encode them. Resizes and encodes run in parallel threads.
+Choosing AVIF also records it for the image, so the Node pass keeps (or, in
+CI, re-encodes) the copies and pages offer them through <picture>.
+
+For every file written, the intrinsic size, a dominant colour and a tiny
+blurred placeholder are computed from the already-decoded source and merged
+into scripts/image-placeholders.json and src/lib/data/imageVariants.generated.ts,
+so pages can reserve space and paint a placeholder without a second pass.
+
 Usage:
     scripts/venv/Scripts/python.exe scripts/convert-image.py
 """
 
+import base64
+import hashlib
+import io
+import json
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -17,6 +35,12 @@ except ImportError:
     print("Error: Pillow is required. Install it with: pip install Pillow")
     sys.exit(1)
 
+try:
+    import numpy as np
+except ImportError:
+    print("Error: NumPy is required. Install it with: pip install numpy")
+    sys.exit(1)
+
 CONTENT_TYPES = [
     "activities",
     "communications",
@@ -29,9 +53,24 @@ CONTENT_TYPES = [
 CARD_WIDTH = 800
 HERO_WIDTH = 1600
 WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+
+# Keep in sync with VARIANT_WIDTHS and RECIPE_VERSION in generate-image-variants.mjs
+VARIANT_WIDTHS = [400, 800, 1600]
+RECIPE_VERSION = "webp-q80-v2"
+
+PLACEHOLDER_WIDTH = 16  # Width of the blurred placeholder thumbnail
+PLACEHOLDER_QUALITY = 40
+COLOR_SAMPLE_WIDTH = 64  # Width the source is reduced to before colour analysis
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 IMAGES_DIR = PROJECT_ROOT / "static" / "images"
+VARIANTS_DIR = IMAGES_DIR / "_r"
+VARIANTS_CACHE_FILE = VARIANTS_DIR / ".variants-cache.json"
+PLACEHOLDERS_FILE = PROJECT_ROOT / "scripts" / "image-placeholders.json"
+CLIENT_MANIFEST_FILE = PROJECT_ROOT / "src" / "lib" / "data" / "imageVariants.generated.ts"
+
+MANIFEST_ENTRY_RE = re.compile(r"^\t'((?:[^'\\]|\\.)*)': \{\n(.*?)\n\t\}", re.MULTILINE | re.DOTALL)
 
 
 def ask_choice(prompt: str, options: list[str]) -> str:
@@ -63,22 +102,186 @@ def ask_yes_no(prompt: str, default: bool = True) -> bool:
         print("Please enter y or n.")
 
 
-def resize_and_save(img: Image.Image, max_width: int, output_path: Path) -> None:
+def sample(img: Image.Image, width: int) -> np.ndarray:
+    """Downscale the decoded image to `width` pixels wide and return it as an HxWx3 array."""
     w, h = img.size
-    if w > max_width:
-        ratio = max_width / w
-        new_size = (max_width, round(h * ratio))
-        resized = img.resize(new_size, Image.LANCZOS)
-    else:
-        resized = img.copy()
+    size = (min(width, w), max(1, round(h * min(width, w) / w)))
+    return np.asarray(img.resize(size, Image.BOX))
+
+
+def dominant_color(pixels: np.ndarray) -> str:
+    """Average colour of the most populated bin when each channel is quantized to 4 bits."""
+    flat = pixels.reshape(-1, 3)
+    bins = flat.astype(np.int32) >> 4
+    index = (bins[:, 0] << 8) | (bins[:, 1] << 4) | bins[:, 2]
+    top = np.bincount(index, minlength=4096).argmax()
+    r, g, b = flat[index == top].mean(axis=0).round().astype(int)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def blurred_placeholder(pixels: np.ndarray) -> str:
+    """3x3 box-blur a thumbnail and encode it as a WebP data URI."""
+    h, w = pixels.shape[:2]
+    padded = np.pad(pixels.astype(np.float32), ((1, 1), (1, 1), (0, 0)), mode="edge")
+    blurred = sum(padded[dy:dy + h, dx:dx + w] for dy in range(3) for dx in range(3)) / 9
+
+    buffer = io.BytesIO()
+    Image.fromarray(blurred.round().astype(np.uint8), "RGB").save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def quote_manifest_key(key: str) -> str:
+    return key.replace("\\", "\\\\").replace("'", "\\'")
+
+
+def render_manifest_entry(key: str, record: dict) -> str:
+    """Render one entry exactly as renderClientManifest in generate-image-variants.mjs does."""
+    widths = [width for width in VARIANT_WIDTHS if width < record["width"]]
+    fields = [
+        f"sourceWidth: {record['width']}",
+        f"sourceHeight: {record['height']}",
+        f"widths: [{', '.join(str(width) for width in widths)}]",
+    ]
+    if record.get("avif"):
+        fields.append("avif: true")
+    fields += [
+        f"color: '{record['color']}'",
+        f"placeholder: '{record['placeholder']}'",
+    ]
+    body = ",\n".join(f"\t\t{field}" for field in fields)
+    return f"\t'{quote_manifest_key(key)}': {{\n{body}\n\t}}"
+
+
+def update_manifests(records: dict) -> None:
+    """
+    Merge placeholder records into image-placeholders.json and upsert their
+    entries in the generated client manifest. The next `npm run gen:images`
+    rebuilds the manifest from the JSON, so the two never disagree for long.
+    """
+    try:
+        placeholders = json.loads(PLACEHOLDERS_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        placeholders = {}
+    placeholders.update(records)
+    PLACEHOLDERS_FILE.write_text(
+        json.dumps(dict(sorted(placeholders.items())), indent="\t", ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+    print(f"  Updated: {PLACEHOLDERS_FILE.relative_to(PROJECT_ROOT)}")
+
+    try:
+        manifest = CLIENT_MANIFEST_FILE.read_text(encoding="utf-8")
+    except OSError:
+        print("  Client manifest not found; run `npm run gen:images` to create it.")
+        return
+
+    body_start = manifest.index("= {\n") + len("= {\n")
+    body_end = manifest.rindex("\n};")
+    entries = {
+        re.sub(r"\\(.)", r"\1", match.group(1)): match.group(0)
+        for match in MANIFEST_ENTRY_RE.finditer(manifest, body_start, body_end)
+    }
+    for key, record in records.items():
+        entries[key] = render_manifest_entry(key, record)
+
+    # Node orders entries with localeCompare; a case-insensitive sort is close
+    # enough, and gen:images restores its exact order on the next build.
+    ordered = sorted(entries.items(), key=lambda item: (item[0].casefold(), item[0]))
+    manifest = manifest[:body_start] + ",\n".join(entry for _, entry in ordered) + manifest[body_end:]
+    CLIENT_MANIFEST_FILE.write_text(manifest, encoding="utf-8")
+    print(f"  Updated: {CLIENT_MANIFEST_FILE.relative_to(PROJECT_ROOT)}")
 
-    resized.save(output_path, "WEBP", quality=WEBP_QUALITY)
-    size_kb = output_path.stat().st_size / 1024
-    print(f"  Saved: {output_path.relative_to(PROJECT_ROOT)} ({resized.size[0]}x{resized.size[1]}, {size_kb:.0f} KB)")
+
+def avif_supported() -> bool:
+    """Whether this Pillow build (or the pillow-avif-plugin) can encode AVIF."""
+    try:
+        import pillow_avif  # noqa: F401 - registers the encoder on older Pillow
+    except ImportError:
+        pass
+    Image.init()
+    return "AVIF" in Image.SAVE
+
+
+def plan_outputs(source_width: int, max_width: int, output_path: Path, avif: bool) -> list[tuple[int, str, Path]]:
+    """
+    List the (width, format, path) outputs for one target: the main WebP, the
+    smaller ladder widths under _r/ and, with avif, an AVIF copy of each.
+    """
+    width = min(source_width, max_width)
+    ladder = [w for w in VARIANT_WIDTHS if w < width]
+    rel_no_ext = output_path.relative_to(IMAGES_DIR).with_suffix("").as_posix()
+
+    outputs = [(width, "WEBP", output_path)]
+    outputs += [(w, "WEBP", VARIANTS_DIR / f"{rel_no_ext}-{w}.webp") for w in ladder]
+    if avif:
+        outputs += [(w, "AVIF", VARIANTS_DIR / f"{rel_no_ext}-{w}.avif") for w in ladder + [width]]
+    return outputs
+
+
+def resize(img: Image.Image, max_width: int) -> Image.Image:
+    w, h = img.size
+    if w <= max_width:
+        return img
+    ratio = max_width / w
+    return img.resize((max_width, round(h * ratio)), Image.LANCZOS)
+
+
+def save(img: Image.Image, output_path: Path, image_format: str) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    quality = AVIF_QUALITY if image_format == "AVIF" else WEBP_QUALITY
+    img.save(output_path, image_format, quality=quality)
+
+
+def encode_outputs(img: Image.Image, outputs: list[tuple[int, str, Path]]) -> dict[int, tuple[int, int]]:
+    """
+    Resize once per width and encode that width's outputs, with widths in
+    parallel threads (Pillow releases the GIL while resampling and encoding).
+    Outputs of one width are saved one after another: Image.save keeps the
+    encoder options on the image, so concurrent saves of one image can swap
+    their quality settings. Returns the pixel size produced for each width.
+    """
+    widths = sorted({width for width, _, _ in outputs})
+
+    def encode_width(width: int) -> Image.Image:
+        resized = resize(img, width)
+        for output_width, image_format, output_path in outputs:
+            if output_width == width:
+                save(resized, output_path, image_format)
+        return resized
+
+    with ThreadPoolExecutor() as pool:
+        resized = dict(zip(widths, pool.map(encode_width, widths)))
+
+    for width, _, output_path in outputs:
+        w, h = resized[width].size
+        size_kb = output_path.stat().st_size / 1024
+        print(f"  Saved: {output_path.relative_to(PROJECT_ROOT)} ({w}x{h}, {size_kb:.0f} KB)")
+
+    return {width: image.size for width, image in resized.items()}
+
+
+def update_variants_cache(entries: dict) -> None:
+    """
+    Record freshly written ladders in the generate-image-variants.mjs cache,
+    keyed the way it keys them, so the Node pass reuses them.
+    """
+    try:
+        cache = json.loads(VARIANTS_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+    if cache.get("recipeVersion") != RECIPE_VERSION:
+        cache = {"recipeVersion": RECIPE_VERSION, "images": {}}
+
+    for rel, (data, widths) in entries.items():
+        cache_key = hashlib.sha256(RECIPE_VERSION.encode("utf-8") + data).hexdigest()
+        cache["images"][rel] = {"cacheKey": cache_key, "widths": widths}
+
+    VARIANTS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    VARIANTS_CACHE_FILE.write_text(json.dumps(cache, indent="\t") + "\n", encoding="utf-8")
 
 
 def main() -> None:
-    print("=== Image to WebP Converter ===")
+    print("=== Image to WebP/AVIF Converter ===")
 
     # 1. Source image
     while True:
@@ -104,6 +307,12 @@ def main() -> None:
         print("Nothing to generate. Exiting.")
         return
 
+    if avif_supported():
+        generate_avif = ask_yes_no("Also generate AVIF versions?", default=False)
+    else:
+        generate_avif = False
+        print("AVIF encoding is unavailable in this Pillow build (try: pip install pillow-avif-plugin); WebP only.")
+
     # 5. Open source image
     try:
         img = Image.open(source_path)
@@ -117,20 +326,52 @@ def main() -> None:
     output_dir = IMAGES_DIR / content_type
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # 6. Generate
+    # 6. Placeholder data, shared by every size since they keep the aspect ratio
+    color = dominant_color(sample(img, COLOR_SAMPLE_WIDTH))
+    placeholder = blurred_placeholder(sample(img, PLACEHOLDER_WIDTH))
+
+    # 7. Generate every width and format from the decoded source
+    targets = []
     if generate_card:
         card_path = output_dir / f"{slug}.webp"
         if card_path.exists() and not ask_yes_no(f"  {card_path.name} already exists. Overwrite?", default=False):
             print("  Skipped card image.")
         else:
-            resize_and_save(img, CARD_WIDTH, card_path)
+            targets.append((CARD_WIDTH, card_path))
 
     if generate_hero:
         hero_path = output_dir / f"{slug}-hero.webp"
         if hero_path.exists() and not ask_yes_no(f"  {hero_path.name} already exists. Overwrite?", default=False):
             print("  Skipped hero image.")
         else:
-            resize_and_save(img, HERO_WIDTH, hero_path)
+            targets.append((HERO_WIDTH, hero_path))
+
+    plans = [(output_path, plan_outputs(img.size[0], max_width, output_path, generate_avif))
+             for max_width, output_path in targets]
+    sizes = encode_outputs(img, [output for _, outputs in plans for output in outputs])
+
+    # 8. Record sizes, placeholders and ladders for the site
+    records = {}
+    ladders = {}
+    for output_path, outputs in plans:
+        rel = output_path.relative_to(IMAGES_DIR).as_posix()
+        main_width = outputs[0][0]
+        width, height = sizes[main_width]
+        data = output_path.read_bytes()
+        records[rel] = {
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "width": width,
+            "height": height,
+            "color": color,
+            "placeholder": placeholder,
+        }
+        if generate_avif:
+            records[rel]["avif"] = True
+        ladders[rel] = (data, [w for w in VARIANT_WIDTHS if w < width])
+
+    if records:
+        update_manifests(records)
+        update_variants_cache(ladders)
 
     print("\nDone!")
 
@@ -8,6 +8,15 @@
  * A content-addressed cache lives beside the ignored derivatives. This keeps
  * restored CI caches useful even when checkout mtimes change. The tracked
  * TypeScript manifest is consumed synchronously by imageVariants.ts.
+ *
+ * scripts/convert-image.py may also write these derivatives (plus optional
+ * AVIF copies at each width) and seed the cache, in which case they are reused.
+ *
+ * Intrinsic height, dominant colour and a blurred placeholder are recorded by
+ * scripts/convert-image.py when it writes an image. They are carried into the
+ * manifest while the recorded hash still matches the file on disk. Images it
+ * converted with AVIF get an AVIF copy at every width and the original width;
+ * missing copies are encoded here, since _r/ is rebuilt in CI.
  */
 import { createHash } from 'node:crypto';
 import { readdir, mkdir, readFile, rm, stat, writeFile } from 'node:fs/promises';
@@ -20,11 +29,13 @@ const IMAGES_DIR = join(root, 'static', 'images');
 const OUT_DIR = join(IMAGES_DIR, '_r');
 const CACHE_FILE = join(OUT_DIR, '.variants-cache.json');
 const CLIENT_MANIFEST_FILE = join(root, 'src', 'lib', 'data', 'imageVariants.generated.ts');
+const PLACEHOLDERS_FILE = join(root, 'scripts', 'image-placeholders.json');
 const CHECK_ONLY = process.argv.includes('--check');
 
 export const VARIANT_WIDTHS = [400, 800, 1600];
 const RASTER_EXT = new Set(['.webp', '.jpg', '.jpeg', '.png', '.avif']);
 const RECIPE_VERSION = 'webp-q80-v2';
+const AVIF_QUALITY = 60; // Matches AVIF_QUALITY in convert-image.py
 
 async function* walk(dir) {
 	for (const entry of await readdir(dir, { withFileTypes: true })) {
@@ -54,11 +65,21 @@ function cacheKey(buffer) {
 	return createHash('sha256').update(RECIPE_VERSION).update(buffer).digest('hex');
 }
 
+function contentHash(buffer) {
+	return createHash('sha256').update(buffer).digest('hex');
+}
+
 function renderClientManifest(images) {
 	const entries = Object.entries(images)
-		.map(([path, { sourceWidth, widths }]) => {
+		.map(([path, { sourceWidth, sourceHeight, widths, avif, color, placeholder }]) => {
 			const quotedPath = path.replaceAll('\\', '\\\\').replaceAll("'", "\\'");
-			return `\t'${quotedPath}': {\n\t\tsourceWidth: ${sourceWidth},\n\t\twidths: [${widths.join(', ')}]\n\t}`;
+			const fields = [`sourceWidth: ${sourceWidth}`];
+			if (sourceHeight !== undefined) fields.push(`sourceHeight: ${sourceHeight}`);
+			fields.push(`widths: [${widths.join(', ')}]`);
+			if (avif) fields.push('avif: true');
+			if (color !== undefined) fields.push(`color: '${color}'`);
+			if (placeholder !== undefined) fields.push(`placeholder: '${placeholder}'`);
+			return `\t'${quotedPath}': {\n${fields.map((field) => `\t\t${field}`).join(',\n')}\n\t}`;
 		})
 		.join(',\n');
 
@@ -67,7 +88,11 @@ function renderClientManifest(images) {
  */
 export interface ImageVariantManifestEntry {
 \treadonly sourceWidth: number;
+\treadonly sourceHeight?: number;
 \treadonly widths: readonly number[];
+\treadonly avif?: boolean;
+\treadonly color?: string;
+\treadonly placeholder?: string;
 }
 
 export const imageVariantManifest: Readonly<Record<string, ImageVariantManifestEntry>> = {
@@ -87,6 +112,7 @@ async function fileExists(path) {
 
 const startedAt = Date.now();
 const previousCache = await readJson(CACHE_FILE, { recipeVersion: '', images: {} });
+const placeholders = await readJson(PLACEHOLDERS_FILE, {});
 const files = [];
 for await (const file of walk(IMAGES_DIR)) {
 	if (RASTER_EXT.has(extname(file).toLowerCase())) files.push(file);
@@ -96,6 +122,8 @@ files.sort((a, b) => a.localeCompare(b));
 const clientImages = {};
 const nextCache = { recipeVersion: RECIPE_VERSION, images: {} };
 const expectedOutputs = new Set();
+// AVIF copies exist only for images convert-image.py converted with AVIF.
+const expectedAvif = new Set();
 const staleReasons = [];
 let generated = 0;
 let skipped = 0;
@@ -113,6 +141,20 @@ for (const file of files) {
 	const widths = VARIANT_WIDTHS.filter((width) => width < metadata.width);
 	const sourceCacheKey = cacheKey(sourceBuffer);
 	clientImages[rel] = { sourceWidth: metadata.width, widths };
+	const record = placeholders[rel];
+	const recordMatches = record?.sha256 === contentHash(sourceBuffer);
+	const avif = recordMatches && record.avif === true;
+	if (recordMatches) {
+		const { height, color, placeholder } = record;
+		clientImages[rel] = {
+			sourceWidth: metadata.width,
+			sourceHeight: height,
+			widths,
+			avif,
+			color,
+			placeholder
+		};
+	}
 	nextCache.images[rel] = { cacheKey: sourceCacheKey, widths };
 
 	const previous = previousCache.images?.[rel];
@@ -121,13 +163,18 @@ for (const file of files) {
 		previous?.cacheKey === sourceCacheKey &&
 		JSON.stringify(previous.widths) === JSON.stringify(widths);
 
-	for (const width of widths) {
-		const outFile = join(OUT_DIR, `${relNoExt}-${width}.webp`);
-		expectedOutputs.add(outFile);
+	const outputs = widths.map((width) => ({ width, format: 'webp' }));
+	if (avif) {
+		for (const width of [...widths, metadata.width]) outputs.push({ width, format: 'avif' });
+	}
+
+	for (const { width, format } of outputs) {
+		const outFile = join(OUT_DIR, `${relNoExt}-${width}.${format}`);
+		(format === 'avif' ? expectedAvif : expectedOutputs).add(outFile);
 		const outputExists = await fileExists(outFile);
 
 		if (CHECK_ONLY) {
-			if (!cacheMatches || !outputExists) staleReasons.push(`${rel} (${width}w)`);
+			if (!cacheMatches || !outputExists) staleReasons.push(`${rel} (${width}w ${format})`);
 			continue;
 		}
 
@@ -137,7 +184,11 @@ for (const file of files) {
 		}
 
 		await mkdir(dirname(outFile), { recursive: true });
-		await sharp(sourceBuffer).resize({ width }).webp({ quality: 80 }).toFile(outFile);
+		const resized = sharp(sourceBuffer).resize({ width });
+		await (format === 'avif'
+			? resized.avif({ quality: AVIF_QUALITY })
+			: resized.webp({ quality: 80 })
+		).toFile(outFile);
 		generated++;
 	}
 }
@@ -164,7 +215,11 @@ if (CHECK_ONLY) {
 
 	// Remove obsolete derivatives left by deleted images or previous width rules.
 	for await (const output of walk(OUT_DIR)) {
-		if (extname(output).toLowerCase() === '.webp' && !expectedOutputs.has(output)) {
+		const extension = extname(output).toLowerCase();
+		if (
+			(extension === '.webp' && !expectedOutputs.has(output)) ||
+			(extension === '.avif' && !expectedAvif.has(output))
+		) {
 			await rm(output);
 		}
 	}
@@ -3,7 +3,11 @@
  */
 export interface ImageVariantManifestEntry {
 	readonly sourceWidth: number;
+	readonly sourceHeight?: number;
 	readonly widths: readonly number[];
+	readonly avif?: boolean;
+	readonly color?: string;
+	readonly placeholder?: string;
 }
 
 export const imageVariantManifest: Readonly<Record<string, ImageVariantManifestEntry>> = {
@@ -1,10 +1,23 @@
 import { describe, it, expect } from 'vitest';
-import { buildSrcset, resolveImagePath } from './imageVariants';
+import {
+	buildAvifSrcset,
+	buildSrcset,
+	getImagePlaceholder,
+	resolveImagePath
+} from './imageVariants';
 
 const manifest = {
 	'activities/talk.webp': { sourceWidth: 1280, widths: [400, 800] },
 	'foo.jpg': { sourceWidth: 640, widths: [400] },
-	'small.png': { sourceWidth: 320, widths: [] }
+	'small.png': { sourceWidth: 320, widths: [] },
+	'activities/converted.webp': {
+		sourceWidth: 800,
+		sourceHeight: 533,
+		widths: [400],
+		avif: true,
+		color: '#5a4632',
+		placeholder: 'data:image/webp;base64,UklGRg=='
+	}
 } as const;
 
 describe('buildSrcset', () => {
@@ -36,6 +49,37 @@ describe('buildSrcset', () => {
 	});
 });
 
+describe('buildAvifSrcset', () => {
+	it('lists the AVIF copy at every ladder width and the original width', () => {
+		expect(buildAvifSrcset('/site/images/activities/converted.webp', manifest)).toBe(
+			'/site/images/_r/activities/converted-400.avif 400w, /site/images/_r/activities/converted-800.avif 800w'
+		);
+	});
+
+	it('returns undefined for images without AVIF copies', () => {
+		expect(buildAvifSrcset('/images/activities/talk.webp', manifest)).toBeUndefined();
+		expect(buildAvifSrcset('/images/unknown.webp', manifest)).toBeUndefined();
+		expect(buildAvifSrcset('https://example.com/images/foo.webp', manifest)).toBeUndefined();
+	});
+});
+
+describe('getImagePlaceholder', () => {
+	it('returns the recorded size, colour and placeholder', () => {
+		expect(getImagePlaceholder('/site/images/activities/converted.webp', manifest)).toEqual({
+			width: 800,
+			height: 533,
+			color: '#5a4632',
+			placeholder: 'data:image/webp;base64,UklGRg=='
+		});
+	});
+
+	it('returns undefined for images without a recorded placeholder', () => {
+		expect(getImagePlaceholder('/images/activities/talk.webp', manifest)).toBeUndefined();
+		expect(getImagePlaceholder('/images/unknown.webp', manifest)).toBeUndefined();
+		expect(getImagePlaceholder('https://example.com/images/foo.webp', manifest)).toBeUndefined();
+	});
+});
+
 describe('resolveImagePath', () => {
 	it('prefixes the base path', () => {
 		expect(resolveImagePath('images/activities/talk.webp', '/site')).toBe(
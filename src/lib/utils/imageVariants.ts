@@ -27,14 +27,16 @@ function decodeManifestKey(path: string): string {
 	}
 }
 
-/**
- * Build a srcset whose descriptors match the intrinsic width of every file.
- * Small images without a useful downscaled derivative simply use `src`.
- */
-export function buildSrcset(
+interface ManifestMatch {
+	readonly prefix: string;
+	readonly name: string;
+	readonly entry: ImageVariantManifestEntry;
+}
+
+function matchManifestEntry(
 	src: string | null | undefined,
-	manifest: Readonly<Record<string, ImageVariantManifestEntry>> = imageVariantManifest
-): string | undefined {
+	manifest: Readonly<Record<string, ImageVariantManifestEntry>>
+): ManifestMatch | undefined {
 	if (!src || src.startsWith('http://') || src.startsWith('https://')) return undefined;
 	const match = src.match(IMAGE_PATH_RE);
 	if (!match) return undefined;
@@ -42,13 +44,69 @@ export function buildSrcset(
 	const prefix = match[1];
 	const name = match[2];
 	const extension = match[3];
-	if (!name || !extension || name.startsWith('_r/')) return undefined;
+	if (!prefix || !name || !extension || name.startsWith('_r/')) return undefined;
 
-	const manifestKey = decodeManifestKey(`${name}.${extension}`);
-	const entry = manifest[manifestKey];
-	if (!entry || entry.widths.length === 0) return undefined;
+	const entry = manifest[decodeManifestKey(`${name}.${extension}`)];
+	return entry ? { prefix, name, entry } : undefined;
+}
 
+/**
+ * Build a srcset whose descriptors match the intrinsic width of every file.
+ * Small images without a useful downscaled derivative simply use `src`.
+ */
+export function buildSrcset(
+	src: string | null | undefined,
+	manifest: Readonly<Record<string, ImageVariantManifestEntry>> = imageVariantManifest
+): string | undefined {
+	const match = matchManifestEntry(src, manifest);
+	if (!match || match.entry.widths.length === 0) return undefined;
+
+	const { prefix, name, entry } = match;
 	const candidates = entry.widths.map((width) => `${prefix}_r/${name}-${width}.webp ${width}w`);
 	candidates.push(`${src} ${entry.sourceWidth}w`);
 	return candidates.join(', ');
 }
+
+/**
+ * AVIF counterpart of buildSrcset for images converted with AVIF copies, which
+ * exist at every ladder width and at the original width. Meant for a
+ * `<source type="image/avif">`, so browsers without AVIF keep the WebP set.
+ */
+export function buildAvifSrcset(
+	src: string | null | undefined,
+	manifest: Readonly<Record<string, ImageVariantManifestEntry>> = imageVariantManifest
+): string | undefined {
+	const match = matchManifestEntry(src, manifest);
+	if (!match?.entry.avif) return undefined;
+
+	const { prefix, name, entry } = match;
+	return [...entry.widths, entry.sourceWidth]
+		.map((width) => `${prefix}_r/${name}-${width}.avif ${width}w`)
+		.join(', ');
+}
+
+export interface ImagePlaceholder {
+	readonly width: number;
+	readonly height: number;
+	readonly color: string;
+	readonly placeholder: string;
+}
+
+/**
+ * Intrinsic size, dominant colour and blurred data-URI placeholder recorded by
+ * scripts/convert-image.py, so a page can reserve the image's box and paint
+ * something before the bytes arrive. Images converted by other means have none.
+ */
+export function getImagePlaceholder(
+	src: string | null | undefined,
+	manifest: Readonly<Record<string, ImageVariantManifestEntry>> = imageVariantManifest
+): ImagePlaceholder | undefined {
+	const entry = matchManifestEntry(src, manifest)?.entry;
+	if (!entry?.sourceHeight || !entry.color || !entry.placeholder) return undefined;
+	return {
+		width: entry.sourceWidth,
+		height: entry.sourceHeight,
+		color: entry.color,
+		placeholder: entry.placeholder
+	};
+}